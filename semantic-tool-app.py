@@ -1,8 +1,8 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+import plotly.express as px
 import io
-import base64
 import re
 from pathlib import Path
 import os
@@ -227,7 +227,7 @@ st.warning("Veuillez sélectionner votre compte nominatif avant de lancer l'anal
 # Function to process the data
 def process_data(files, config, filters, create_tabs):
     if not files:
-        return None
+        return None, None
     
     # Extract configuration
     keyword_column = config["keyword"]
@@ -294,7 +294,7 @@ def process_data(files, config, filters, create_tabs):
             st.error(f"Erreur lors de la lecture du fichier {file.name}: {str(e)}")
     
     if not dfs:
-        return None
+        return None, None
     
     # Combine all data
     combined_data = pd.concat(all_data, ignore_index=True)
@@ -407,6 +407,10 @@ def process_data(files, config, filters, create_tabs):
     
     interest_table = pd.DataFrame(interest_data)
     
+    # Site summary table (used by the Excel export and the in-app explorer)
+    summary_data = pd.DataFrame.from_dict(site_summaries, orient='index').reset_index()
+    summary_data.rename(columns={'index': 'Site'}, inplace=True)
+    
     # Create Excel file in memory
     output = io.BytesIO()
     with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
@@ -556,9 +560,6 @@ def process_data(files, config, filters, create_tabs):
         # 4. Write individual site sheets if requested
         if create_tabs:
             # First, write summary sheet with key metrics
-            summary_data = pd.DataFrame.from_dict(site_summaries, orient='index').reset_index()
-            summary_data.rename(columns={'index': 'Site'}, inplace=True)
-            
             summary_data.to_excel(writer, sheet_name='Résumé par site', index=False)
             summary_ws = writer.sheets['Résumé par site']
             
@@ -601,10 +602,179 @@ def process_data(files, config, filters, create_tabs):
                 })
     
     output.seek(0)
-    return output
+    
+    # Keep the computed tables for the in-app explorer
+    results = {
+        "tables": {
+            "Mots-clés & concurrence": result_data,
+            "Table des intérêts": interest_table,
+            "Résumé par site": summary_data,
+        },
+        "keyword_column": keyword_column,
+        "volume_column": volume_column if volume_column and volume_column in result_data.columns else None,
+    }
+    return output, results
+
+# Maximum number of points sent to the browser for the position / volume scatter plot
+MAX_CHART_POINTS = 5000
+
+def get_sorted_positions(df, search, search_column, numeric_filters, sort_column, ascending):
+    """Return the row positions of df matching the search and numeric filters, in the requested order.
+    
+    numeric_filters is a tuple of (column, operator, value) with operator ">=" or "<=".
+    Only the filtered and sorted columns are read, the rest of the table is never copied.
+    """
+    mask = np.ones(len(df), dtype=bool)
+    if search and search_column in df.columns:
+        mask &= df[search_column].astype(str).str.contains(search.strip(), case=False, regex=False, na=False).to_numpy()
+    for column, operator, value in numeric_filters:
+        values = df[column].to_numpy(dtype=float, na_value=np.nan)
+        # NaN comparisons are False, so unpositioned keywords are filtered out
+        mask &= (values >= value) if operator == ">=" else (values <= value)
+    positions = np.flatnonzero(mask)
+    
+    if sort_column:
+        values = pd.Series(df[sort_column].to_numpy()[positions], index=positions)
+        positions = values.sort_values(ascending=ascending, kind='stable', na_position='last').index.to_numpy()
+    
+    return positions
+
+def get_chart_points(analysis_results, site_column):
+    """Return the (downsampled) points of the position / volume scatter plot for one site.
+    
+    Points are computed once per analysis and per site, and kept in session state.
+    Keywords with a zero volume are excluded because they cannot be shown on a log axis.
+    """
+    chart_points = analysis_results["chart_points"]
+    if site_column not in chart_points:
+        results = analysis_results["results"]
+        keyword_column = results["keyword_column"]
+        volume_column = results["volume_column"]
+        result_data = results["tables"]["Mots-clés & concurrence"]
+        
+        points = result_data[[keyword_column, site_column, volume_column]].dropna()
+        zero_volume = int((points[volume_column] <= 0).sum())
+        points = points[points[volume_column] > 0]
+        total_points = len(points)
+        if total_points > MAX_CHART_POINTS:
+            # Downsample so that the browser only receives a bounded number of points
+            points = points.sample(n=MAX_CHART_POINTS, random_state=0)
+        chart_points[site_column] = {"points": points, "total": total_points, "zero_volume": zero_volume}
+    return chart_points[site_column]
+
+def render_results_explorer(analysis_results):
+    """Display the computed tables with server-side filtering, sorting and pagination, plus aggregated charts."""
+    results = analysis_results["results"]
+    st.header("Explorateur des résultats")
+    
+    table_name = st.selectbox(
+        "Sélectionner un **tableau** :",
+        list(results["tables"]),
+        key="explorer_table"
+    )
+    df = results["tables"][table_name]
+    is_keyword_table = table_name == "Mots-clés & concurrence"
+    search_column = results["keyword_column"] if is_keyword_table else "Site"
+    position_columns = [col for col in df.columns if col.startswith("Position - ")]
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        search = st.text_input(f"Rechercher dans **{search_column}** :", key="explorer_search")
+    with col2:
+        sort_column = st.selectbox("Trier par :", ["Ordre par défaut"] + list(df.columns), key="explorer_sort")
+    with col3:
+        sort_order = st.selectbox("Ordre :", ["Décroissant", "Croissant"], key="explorer_order_dir")
+    with col4:
+        page_size = st.selectbox("Lignes par page :", [25, 50, 100, 250], key="explorer_page_size")
+    
+    # Numeric filters on the keyword table (0 = no filter)
+    numeric_filters = []
+    if is_keyword_table:
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            min_sites_explorer = st.number_input("Nombre minimum de sites :", min_value=0, value=0, key="explorer_min_sites")
+        with col2:
+            position_site = st.selectbox("Site pour le filtre de position :", ["Aucun"] + position_columns, key="explorer_position_site")
+        with col3:
+            max_position = st.number_input("Position maximum :", min_value=0, value=0, key="explorer_max_position")
+        if min_sites_explorer > 0:
+            numeric_filters.append(("Nombre de sites", ">=", min_sites_explorer))
+        if position_site != "Aucun" and max_position > 0:
+            numeric_filters.append((position_site, "<=", max_position))
+    numeric_filters = tuple(numeric_filters)
+    
+    if sort_column == "Ordre par défaut":
+        sort_column = None
+    ascending = sort_order == "Croissant"
+    
+    # Cache the order so that browsing through pages does not filter and sort the whole table again
+    cache_key = (table_name, search, numeric_filters, sort_column, ascending)
+    cached = st.session_state.get("explorer_order")
+    if cached is None or cached["key"] != cache_key:
+        positions = get_sorted_positions(df, search, search_column, numeric_filters, sort_column, ascending)
+        cached = {"key": cache_key, "positions": positions}
+        st.session_state.explorer_order = cached
+    positions = cached["positions"]
+    
+    total_rows = len(positions)
+    total_pages = max(1, -(-total_rows // page_size))
+    
+    # Go back to the first page when the result set or the page size changes, and keep the page in range
+    view_key = (cache_key, page_size)
+    if st.session_state.get("explorer_view_key") != view_key:
+        st.session_state.explorer_view_key = view_key
+        st.session_state.explorer_page = 1
+    elif st.session_state.get("explorer_page", 1) > total_pages:
+        st.session_state.explorer_page = total_pages
+    page = st.number_input(f"Page (sur {total_pages}) :", min_value=1, max_value=total_pages, key="explorer_page")
+    
+    # Only the visible page is sent to the browser
+    start = (page - 1) * page_size
+    end = min(start + page_size, total_rows)
+    st.dataframe(df.iloc[positions[start:end]], use_container_width=True, hide_index=True)
+    st.caption(f"Lignes {start + 1 if total_rows else 0}-{end} sur {total_rows}")
+    
+    # Charts built from aggregated data so that they stay responsive on large exports
+    st.subheader("Visualisations")
+    interest_table = results["tables"]["Table des intérêts"]
+    
+    count_columns = [col for col in interest_table.columns if col.startswith("Mots-clés ")]
+    counts = interest_table.melt(id_vars="Site", value_vars=count_columns, var_name="Positions", value_name="Mots-clés")
+    counts["Positions"] = counts["Positions"].str.replace("Mots-clés ", "", regex=False)
+    fig = px.bar(counts, x="Positions", y="Mots-clés", color="Site", barmode="group",
+                 title="Répartition des mots-clés par tranche de positions")
+    st.plotly_chart(fig, use_container_width=True)
+    
+    volume_columns = [col for col in interest_table.columns if col.startswith("Volume ")]
+    if volume_columns:
+        volumes = interest_table.melt(id_vars="Site", value_vars=volume_columns, var_name="Positions", value_name="Volume")
+        volumes["Positions"] = volumes["Positions"].str.replace("Volume ", "", regex=False)
+        fig = px.bar(volumes, x="Positions", y="Volume", color="Site", barmode="group",
+                     title="Volume de recherche par tranche de positions")
+        st.plotly_chart(fig, use_container_width=True)
+    
+    volume_column = results["volume_column"]
+    result_data = results["tables"]["Mots-clés & concurrence"]
+    chart_columns = [col for col in result_data.columns if col.startswith("Position - ")]
+    if volume_column and chart_columns:
+        site_column = st.selectbox("Site pour le nuage position / volume :", chart_columns, key="explorer_chart_site")
+        chart = get_chart_points(analysis_results, site_column)
+        points = chart["points"]
+        if chart["total"] > len(points):
+            st.caption(f"Échantillon de {len(points)} mots-clés affiché sur {chart['total']}.")
+        if chart["zero_volume"]:
+            st.caption(f"{chart['zero_volume']} mots-clés à volume nul exclus (échelle logarithmique).")
+        fig = px.scatter(points, x=site_column, y=volume_column, hover_name=results["keyword_column"],
+                         log_y=True, title="Position et volume des mots-clés")
+        st.plotly_chart(fig, use_container_width=True)
 
 # Process button - Toujours visible et actif
 if st.button("Lancer l'analyse"):
+    # Drop the previous run so its results are never shown alongside a failed new run
+    st.session_state.pop("analysis_results", None)
+    st.session_state.pop("explorer_order", None)
+    st.session_state.pop("explorer_view_key", None)
+    
     if not uploaded_files:
         st.error("Veuillez importer au moins un fichier pour l'analyse.")
     else:
@@ -636,33 +806,28 @@ if st.button("Lancer l'analyse"):
         with st.spinner("Traitement des données en cours..."):
             try:
                 # Process data
-                excel_data = process_data(uploaded_files, config, filters, create_specific_tabs)
+                excel_data, results = process_data(uploaded_files, config, filters, create_specific_tabs)
                 
                 if excel_data:
-                    # Create download link
-                    b64 = base64.b64encode(excel_data.read()).decode()
-                    href = f'<a href="data:application/vnd.openxmlformats-officedocument.spreadsheetml.sheet;base64,{b64}" download="analyse_semantique.xlsx" class="download-button">Télécharger le fichier Excel d\'analyse</a>'
-                    
-                    st.markdown("""
-                    <style>
-                    .download-button {
-                        display: inline-block;
-                        padding: 0.5em 1em;
-                        color: white;
-                        background-color: #4CAF50;
-                        text-decoration: none;
-                        border-radius: 4px;
-                        font-weight: bold;
-                        margin: 1em 0;
-                    }
-                    .download-button:hover {
-                        background-color: #45a049;
+                    # Keep results across reruns triggered by the explorer widgets
+                    st.session_state.analysis_results = {
+                        "excel": excel_data.read(),
+                        "results": results,
+                        "chart_points": {}
                     }
-                    </style>
-                    """, unsafe_allow_html=True)
-                    
-                    st.markdown(href, unsafe_allow_html=True)
-                    st.success("Analyse terminée avec succès ! Cliquez sur le bouton ci-dessus pour télécharger le fichier d'analyse.")
+                    st.success("Analyse terminée avec succès ! Cliquez sur le bouton ci-dessous pour télécharger le fichier d'analyse.")
             except Exception as e:
                 st.error(f"Une erreur s'est produite lors du traitement des données: {str(e)}")
                 st.info("Si les noms de colonnes ne correspondent pas, veuillez vérifier les noms exacts dans vos fichiers.")
+
+if "analysis_results" in st.session_state:
+    analysis_results = st.session_state.analysis_results
+    
+    st.download_button(
+        "Télécharger le fichier Excel d'analyse",
+        data=analysis_results["excel"],
+        file_name="analyse_semantique.xlsx",
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
+    
+    render_results_explorer(analysis_results)